@@ -2,15 +2,14 @@
 
 Module with containing the AIController class, which controls the player using a neural network.
 """
-from copy import deepcopy
 from dataclasses import dataclass, field
-from queue import PriorityQueue
+from heapq import heappop, heappush
 from typing import Optional
 import pygame
 
 from ai_neural_net import NeuralNetGraph
 from game_state import Actor, GameState
-from helpers import grid_distance, within_grid
+from helpers import within_grid
 from vector import Vector
 
 import ai_constants as ai_const
@@ -20,17 +19,17 @@ import game_controls
 
 @dataclass(order=True)
 class TileItem:
-    """A dataclass representing a tile for a PriorityQueue to sort. Note that this allows for
+    """A dataclass representing a tile for a priority queue to sort. Note that this allows for
     the tile to not be sorted as part of the sorting.
 
     Instance Attributes:
         - priority: The priority of this tile.
         - distance: The current distance traveled to this tile.
-        - tile: The tile's position on the grid.
+        - tile: The tile's position on the grid, as integer coordinates.
     """
     priority: int
     distance: int
-    tile: Vector = field(compare=False)
+    tile: tuple[int, int] = field(compare=False)
 
 
 class AIController(game_controls.Controller):
@@ -64,7 +63,7 @@ class AIController(game_controls.Controller):
         self.ticks_alive = 0
         self.last_score = (0, self.ticks_alive)
 
-    def control(self, grid: list[list[int]]) -> None:
+    def control(self, grid: bytearray) -> None:
         """Controls the player using the neural network.
 
         Args:
@@ -97,7 +96,7 @@ class AIController(game_controls.Controller):
         elif self.ticks_alive - self.last_score[1] > timeout:
             self.game.lives = 0
 
-    def is_check_neural_net(self, grid: list[list[int]], directions: list[Vector]) -> bool:
+    def is_check_neural_net(self, grid: bytearray, directions: list[Vector]) -> bool:
         """Returns whether or not the neural network should be checked, depending on if player
         can turn left or right.
 
@@ -109,12 +108,12 @@ class AIController(game_controls.Controller):
         left_tile = tile + directions[1]
         right_tile = tile + directions[-1]
 
-        can_left = grid[left_tile.y][left_tile.x] not in g_const.BAD_TILES
-        can_right = grid[right_tile.y][right_tile.x] not in g_const.BAD_TILES
+        can_left = not g_const.IS_BAD_TILE[grid[left_tile.y * g_const.GRID_WIDTH + left_tile.x]]
+        can_right = not g_const.IS_BAD_TILE[grid[right_tile.y * g_const.GRID_WIDTH + right_tile.x]]
 
         return can_left or can_right
 
-    def get_inputs(self, grid: list[list[int]], directions: list[Vector]) -> None:
+    def get_inputs(self, grid: bytearray, directions: list[Vector]) -> None:
         """Updates the neural network's input nodes.
 
         Args:
@@ -133,18 +132,19 @@ class AIController(game_controls.Controller):
             next_tile = tile + direction
 
             # Check if can move in this direction
-            if not within_grid(next_tile) or grid[next_tile.y][next_tile.x] in g_const.BAD_TILES:
+            if not within_grid(next_tile) or \
+                    g_const.IS_BAD_TILE[grid[next_tile.y * g_const.GRID_WIDTH + next_tile.x]]:
                 inputs.append(ai_const.ACTIVE)
             else:
                 inputs.append(ai_const.INACTIVE)
 
             # Check if score can be increased in this direction
             score_distance = 1
-            while grid[next_tile.y][next_tile.x] not in target_tiles:
+            while grid[next_tile.y * g_const.GRID_WIDTH + next_tile.x] not in target_tiles:
                 next_tile += direction
                 score_distance += 1
 
-            if grid[next_tile.y][next_tile.x] in g_const.BAD_TILES:
+            if g_const.IS_BAD_TILE[grid[next_tile.y * g_const.GRID_WIDTH + next_tile.x]]:
                 inputs.append(ai_const.INACTIVE)
             else:
                 inputs.append(1 / max(ai_const.ACTIVE, score_distance - ai_const.DOTS_BIAS))
@@ -169,7 +169,7 @@ class AIController(game_controls.Controller):
         for node, value in zip(self.neural_net.input_nodes, inputs[:ai_const.INPUT_SIZE]):
             node.value = value
 
-    def a_star_distance(self, grid: list[list[int]], targets: list[Vector],
+    def a_star_distance(self, grid: bytearray, targets: list[Vector],
                         direction: Vector) -> int:
         """By treating the grid as a representation of a graph, A Star is used to return shortest
         distance needed to travel to get to a target position in direction.
@@ -180,51 +180,59 @@ class AIController(game_controls.Controller):
             - direction: The direction to check distance for.
         """
         # Sets up priority queue and copy of grid to track visited nodes.
-        path_grid = deepcopy(grid)
-        tile_queue = PriorityQueue()
+        path_grid = bytearray(grid)
+        tile_queue = []
+        width = g_const.GRID_WIDTH
+        target_tiles = [(target.x, target.y) for target in targets]
 
         tile = self.actor.tile()
         # Don't allow revisiting of initial tile.
-        path_grid[tile.y][tile.x] = g_const.OUT
+        path_grid[tile.y * width + tile.x] = g_const.OUT
 
         # Only append to queue if next direction isn't a bad tile
-        next_tile = tile + direction
-        if path_grid[next_tile.y][next_tile.x] not in g_const.BAD_TILES:
-            tile_queue.put(TileItem(0, 0, next_tile))
+        next_x, next_y = tile.x + direction.x, tile.y + direction.y
+        if not g_const.IS_BAD_TILE[path_grid[next_y * width + next_x]]:
+            heappush(tile_queue, TileItem(0, 0, (next_x, next_y)))
 
         # Loop through until queue empty or target found.
-        while not tile_queue.empty():
-            item = tile_queue.get()
+        while tile_queue:
+            item = heappop(tile_queue)
             distance = item.distance + 1
+            item_x, item_y = item.tile
 
             # Check to see if each direction can be added.
-            for candidate in g_const.DIRECTION.values():
-                next_tile = item.tile + candidate
+            for _, _, dx, dy in g_const.DIRECTION_ITEMS:
+                next_x, next_y = item_x + dx, item_y + dy
+                index = next_y * width + next_x
 
-                if next_tile in targets:
+                if (next_x, next_y) in target_tiles:
                     # Target found!
                     return distance
-                elif path_grid[next_tile.y][next_tile.x] not in g_const.BAD_TILES:
+                elif not g_const.IS_BAD_TILE[path_grid[index]]:
                     # Use heuristic function as part of the given tile's priority.
-                    heuristic = self.distance_heuristic(next_tile, targets)
-                    tile_queue.put(TileItem(heuristic + distance, distance, next_tile))
+                    heuristic = self.distance_heuristic(next_x, next_y, target_tiles)
+                    heappush(tile_queue, TileItem(heuristic + distance, distance, (next_x, next_y)))
 
-                    path_grid[next_tile.y][next_tile.x] = g_const.OUT
+                    path_grid[index] = g_const.OUT
 
         # If no path found.
         return -1
 
     @staticmethod
-    def distance_heuristic(position: Vector, targets: list[Vector]) -> int:
+    def distance_heuristic(x: int, y: int, targets: list[tuple[int, int]]) -> int:
         """Underestimates the real distance by returning the smallest grid distance to a target.
 
         Args:
-            - position: Starting position for distance.
-            - targets: A list of target vectors as endpoints for distance.
+            - x: The x-coordinate of the starting position for distance.
+            - y: The y-coordinate of the starting position for distance.
+            - targets: A list of target tiles as endpoints for distance.
+
+        >>> AIController.distance_heuristic(0, 0, [(3, 4), (1, 1)])
+        2
         """
-        return min(grid_distance(position, target) for target in targets)
+        return min(abs(x - target_x) + abs(y - target_y) for target_x, target_y in targets)
 
-    def control_outputs(self, grid: list[list[int]], directions: list[Vector]) -> None:
+    def control_outputs(self, grid: bytearray, directions: list[Vector]) -> None:
         """Taking the neural network's output nodes, move in an according direction.
 
         Args:
@@ -253,7 +261,7 @@ class AIController(game_controls.Controller):
 if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['copy', 'queue', 'pygame', 'ai_constants', 'ai_neural_net',
+        'extra-imports': ['heapq', 'pygame', 'ai_constants', 'ai_neural_net',
                           'game_constants', 'game_controls', 'game_state', 'helpers', 'vector'],
         'max-line-length': 100,
         'disable': ['E1136']
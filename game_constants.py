@@ -10,6 +10,7 @@ from vector import Vector
 TILE_SIZE = Vector(16, 16)
 TILE_CENTER_X = Vector(TILE_SIZE.x / 2, 0)
 GRID_SIZE = Vector(28, 36)
+GRID_WIDTH = GRID_SIZE.x
 SCREEN_SIZE = TILE_SIZE * GRID_SIZE
 
 # Gameplay Constants
@@ -33,6 +34,8 @@ DIRECTION = {pygame.K_UP: Vector(0, -1),
              pygame.K_LEFT: Vector(-1, 0),
              pygame.K_DOWN: Vector(0, 1),
              pygame.K_RIGHT: Vector(1, 0)}
+DIRECTION_ITEMS = tuple((key, DIRECTION[key], DIRECTION[key].x, DIRECTION[key].y)
+                        for key in DIRECTION_ORDER)
 CORNER = {(0, -1): (-TILE_SIZE.y / 8, TILE_SIZE.y * 3 / 8),
           (-1, 0): (-TILE_SIZE.x / 8, TILE_SIZE.x * 3 / 8),
           (0, 1): (-TILE_SIZE.y * 3 / 8, TILE_SIZE.y / 8),
@@ -53,14 +56,18 @@ ORANGE = (219, 133, 28)
 FRIGHT = (100, 100, 200)
 GHOST_COLOURS = (RED, PINK, TEAL, ORANGE)
 
+# Controller Constants
+BLINKY_INDEX = 0
+
 # Tile Types
-EMPTY = '0'
-WALL = '1'
-DOT = '2'
-BOOST = '5'
-DOOR = '8'
-OUT = '9'
+EMPTY = 0
+WALL = 1
+DOT = 2
+BOOST = 5
+DOOR = 8
+OUT = 9
 BAD_TILES = {WALL, DOOR, OUT}
+IS_BAD_TILE = bytes(tile in BAD_TILES for tile in range(256))
 
 # Round Timing Constants
 BOOST_TIME = 6 * FPS
@@ -2,12 +2,11 @@
 
 Module containing the controller classes used to move the actors in PacMan.
 """
-from typing import Optional
-import random
+from typing import Callable, Optional
 import pygame
 
 from game_state import Actor, GameState
-from helpers import grid_distance, within_grid
+from helpers import grid_distance
 from vector import Vector
 import game_constants as const
 
@@ -34,7 +33,7 @@ class Controller:
 
         game.controllers.append(self)
 
-    def control(self, grid: list[list[int]]) -> None:
+    def control(self, grid: bytearray) -> None:
         """Controls the actor for given tick.
 
         Args:
@@ -58,13 +57,14 @@ class Controller:
 class InputController(Controller):
     """A class representing a controller for an actor which uses keyboard input. """
 
-    def control(self, grid: list[list[int]]) -> None:
+    def control(self, grid: bytearray) -> None:
         """Controls the actor for given tick using keyboard input.
 
         Args:
             - grid: The current game's map grid.
         """
-        if self.game.events is None:
+        # No input events this tick, such as when running without visualization.
+        if not self.game.events:
             return
 
         # Changes direction based on key presses
@@ -100,12 +100,14 @@ class GhostController(Controller):
     mode: str
 
     # Private Instance Attributes:
-    #  - _next_tile : The target tile to arrive to.
+    #  - _next_tile : The target tile to arrive to, as integer grid coordinates.
     #  - _next_direction: The direction to be turned towards when possible
     #  - _is_frightened : Whether ghost is frightened.
-    _next_tile: Optional[Vector]
+    #  - _target_tile: The function returning the target tile for the current mode.
+    _next_tile: Optional[tuple[int, int]]
     _next_direction: Optional[Vector]
     _is_frightened: bool
+    _target_tile: Callable[[], tuple[int, int]]
 
     def __init__(self, game: GameState, actor: Actor) -> None:
         """Initializes a new ghost controller with given game and ghost actor.
@@ -120,10 +122,10 @@ class GhostController(Controller):
         self.home_timer = 0
 
         self.state = 'inactive'
-        self.mode = self.game.mode()
+        self.set_mode(self.game.mode())
         self._is_frightened = False
 
-    def control(self, grid: list[list[int]]) -> None:
+    def control(self, grid: bytearray) -> None:
         """Controls the ghost actor for given tick based on current state or mode.
 
         Args:
@@ -137,87 +139,94 @@ class GhostController(Controller):
                 self._next_direction = None
                 self.actor.reset_direction()
 
-                self.mode = game_mode
+                self.set_mode(game_mode)
 
             # Check if target tile has been reached, or if it is unreachable.
             tile = self.actor.tile()
-            if self._next_tile is not None and grid_distance(self._next_tile, tile) > 1:
-                self._next_tile = None
-            elif self._next_tile is not None and tile != self._next_tile:
-                return
+            tile_x, tile_y = tile.x, tile.y
+            if self._next_tile is not None:
+                next_x, next_y = self._next_tile
+                if abs(next_x - tile_x) + abs(next_y - tile_y) > 1:
+                    self._next_tile = None
+                elif next_x != tile_x or next_y != tile_y:
+                    return
 
             # Change the queued direction.
             self.actor.change_direction(grid, self._next_direction)
 
             # Choose new next tile.
             if self._next_tile is None:
-                self._next_tile = tile
+                self._next_tile = (tile_x, tile_y)
             else:
-                self._next_tile = tile + self._next_direction
+                self._next_tile = (tile_x + self._next_direction.x,
+                                   tile_y + self._next_direction.y)
 
             # Control differently depending on frightened state
             if not self._is_frightened:
-                self.control_target(grid)
+                self.control_target(tile_x, tile_y)
             else:
-                self.control_fright(grid)
+                self.control_fright(tile_x, tile_y)
         elif self.state == 'home':
             self.control_home()
         elif self.state == 'inactive' and self.check_active():
             # If activated, change to home state
             self.state = 'home'
 
-    def control_target(self, grid: list[list[int]]) -> None:
+    def control_target(self, tile_x: int, tile_y: int) -> None:
         """Controls the ghost actor for given tick if in targeting mode.
         Follows the original ghost targeting system closely!
 
         Args:
-            - grid: The current game's map grid.
+            - tile_x: The x-coordinate of the ghost actor's current tile.
+            - tile_y: The y-coordinate of the ghost actor's current tile.
         """
         self._next_direction = -self.actor.state.direction
         best_distance = None
 
-        # Try each direction.
-        for key in const.DIRECTION_ORDER:
-            direction = const.DIRECTION[key]
-            candidate = self._next_tile + direction
+        # Target different things depending on mode, as chosen when the mode was set.
+        target_x, target_y = self._target_tile()
+
+        # Try each direction which doesn't lead into a wall.
+        next_x, next_y = self._next_tile
+        for _, direction, dx, dy in self.game.legal_neighbors[next_y * const.GRID_WIDTH + next_x]:
+            candidate_x, candidate_y = next_x + dx, next_y + dy
 
             # If can't turn in this direction.
-            if not within_grid(candidate) or candidate == self.actor.tile() or \
-                    grid[candidate.y][candidate.x] in const.BAD_TILES:
+            if candidate_x == tile_x and candidate_y == tile_y:
                 continue
 
-            # Target different things depending on mode.
-            if self.mode == 'scatter':
-                distance = grid_distance(candidate, self.scatter_target())
-            else:  # Chase mode case by representation invariant.
-                distance = grid_distance(candidate, self.chase_target())
+            # Grid distance to the target, computed inline on integer tile coordinates.
+            distance = abs(candidate_x - target_x) + abs(candidate_y - target_y)
 
             # Choose this direction if shortest so far.
             if best_distance is None or distance < best_distance:
                 self._next_direction = direction
                 best_distance = distance
 
-    def control_fright(self, grid: list[list[int]]) -> None:
+    def control_fright(self, tile_x: int, tile_y: int) -> None:
         """Controls the ghost actor for given tick if frightened.
         When frightened, it turns a random direction at each intersection.
 
         Args:
-            - grid: The current game's map grid.
+            - tile_x: The x-coordinate of the ghost actor's current tile.
+            - tile_y: The y-coordinate of the ghost actor's current tile.
         """
-        # Collect all possible directions at intersection.
-        candidates = []
-        for key in const.DIRECTION_ORDER:
-            direction = const.DIRECTION[key]
-            candidate = self._next_tile + direction
-
-            # Can't turn in this direction.
-            if within_grid(candidate) and candidate != self.actor.tile() and \
-                    grid[candidate.y][candidate.x] not in const.BAD_TILES:
-                candidates.append(direction)
-
-        # Randomly choose direction from allowed directions.
-        if candidates != []:
-            self._next_direction = random.choice(candidates)
+        next_x, next_y = self._next_tile
+        neighbors = self.game.legal_neighbors[next_y * const.GRID_WIDTH + next_x]
+
+        # Find the direction leading back to the current tile, as it can't be turned into.
+        back_index = len(neighbors)
+        for index, (_, _, dx, dy) in enumerate(neighbors):
+            if next_x + dx == tile_x and next_y + dy == tile_y:
+                back_index = index
+        choices = len(neighbors) - (back_index < len(neighbors))
+
+        # Randomly choose direction from allowed directions, skipping over the one leading back.
+        if choices > 0:
+            index = self.game.rng.randrange(choices)
+            if index >= back_index:
+                index += 1
+            self._next_direction = neighbors[index][1]
         else:
             self._next_direction = -self.actor.state.direction
 
@@ -253,15 +262,28 @@ class GhostController(Controller):
             # Set frightened state.
             self.actor.state.colour = const.FRIGHT
             self.actor.state.speed *= 0.5
-            self.mode = ''
+            self.set_mode('')
         elif self._is_frightened and not is_frightened:
             # Reset to non-frightened state.
             self.actor.reset_colour()
             self.actor.reset_speed()
-            self.mode = ''
+            self.set_mode('')
 
         self._is_frightened = is_frightened
 
+    def set_mode(self, mode: str) -> None:
+        """Sets the mode of the ghost controller, along with the target it will use.
+
+        Args:
+            - mode: The new mode of the ghost controller.
+        """
+        self.mode = mode
+
+        if mode == 'scatter':
+            self._target_tile = self.scatter_target
+        else:  # Chase mode case by representation invariant.
+            self._target_tile = self.chase_target
+
     def get_frightened(self) -> bool:
         """Returns if ghost controller is in a frightened mode."""
         return self._is_frightened
@@ -271,7 +293,7 @@ class GhostController(Controller):
         self._next_tile = None
         self._next_direction = None
 
-        self.mode = self.game.mode()
+        self.set_mode(self.game.mode())
         self.home_timer = 0
 
     def draw_debug(self, screen: pygame.Surface) -> None:
@@ -284,22 +306,22 @@ class GhostController(Controller):
             return
 
         # Draw desired next position.
-        next_position = self._next_tile * const.TILE_SIZE
+        next_position = Vector(*self._next_tile) * const.TILE_SIZE
         pygame.draw.rect(screen, (100, 0, 100), pygame.Rect(*next_position, *const.TILE_SIZE))
 
         # Draw target tile depending on mode
         if self.game.mode() == 'scatter':
-            target_position = self.scatter_target() * const.TILE_SIZE
+            target_position = Vector(*self.scatter_target()) * const.TILE_SIZE
         else:  # Chase mode case
-            target_position = self.chase_target() * const.TILE_SIZE
+            target_position = Vector(*self.chase_target()) * const.TILE_SIZE
 
         pygame.draw.rect(screen, (0, 100, 100), pygame.Rect(*target_position, *const.TILE_SIZE))
 
-    def scatter_target(self) -> Vector:
+    def scatter_target(self) -> tuple[int, int]:
         """Returns the target tile during scatter mode. """
         raise NotImplementedError
 
-    def chase_target(self) -> Vector:
+    def chase_target(self) -> tuple[int, int]:
         """Returns the target tile during chase mode. """
         raise NotImplementedError
 
@@ -329,13 +351,14 @@ class BlinkyController(GhostController):
         super().reset()
         self.state = 'active'
 
-    def scatter_target(self) -> Vector:
+    def scatter_target(self) -> tuple[int, int]:
         """Returns the target tile during scatter mode, the top right corner. """
-        return Vector(25, 0)
+        return 25, 0
 
-    def chase_target(self) -> Vector:
+    def chase_target(self) -> tuple[int, int]:
         """Returns the target tile during chase mode, PacMan itself! """
-        return self.game.player_actor().tile()
+        player_tile = self.game.player_actor().tile()
+        return player_tile.x, player_tile.y
 
     def check_active(self) -> bool:
         """Returns whether or not the ghost controller will be reactivate.
@@ -365,19 +388,21 @@ class PinkyController(GhostController):
         super().reset()
         self.state = 'inactive'
 
-    def scatter_target(self) -> Vector:
+    def scatter_target(self) -> tuple[int, int]:
         """Returns the target tile during scatter mode, the top left corner. """
-        return Vector(2, 0)
+        return 2, 0
 
-    def chase_target(self) -> Vector:
+    def chase_target(self) -> tuple[int, int]:
         """Returns the target tile during chase mode, 4 tiles ahead of PacMan. """
         player = self.game.player_actor()
+        player_tile = player.tile()
+        direction = player.state.direction
 
-        if player.state.direction != const.DIRECTION[pygame.K_UP]:
-            return player.tile() + 4 * player.state.direction
+        if direction != const.DIRECTION[pygame.K_UP]:
+            return player_tile.x + 4 * direction.x, player_tile.y + 4 * direction.y
         else:
             # Replicates the original bug with Pinky's up-targeting
-            return player.tile() + (-4, -4)
+            return player_tile.x - 4, player_tile.y - 4
 
     def check_active(self) -> bool:
         """Returns whether or not the ghost controller will be reactivate.
@@ -413,19 +438,22 @@ class InkyController(GhostController):
         super().reset()
         self.state = 'inactive'
 
-    def scatter_target(self) -> Vector:
+    def scatter_target(self) -> tuple[int, int]:
         """Returns the target tile during scatter mode, the bottom right corner. """
-        return Vector(27, 35)
+        return 27, 35
 
-    def chase_target(self) -> Vector:
+    def chase_target(self) -> tuple[int, int]:
         """Returns the target tile during chase mode, which is opposite of Blinky's position
         relative to PacMan.
         """
         # Note the original bug with Inky's up-targeting is ignored as effect is insignificant
         player = self.game.player_actor()
-        pivot = player.tile() + 2 * player.state.direction
+        player_tile = player.tile()
+        pivot_x = player_tile.x + 2 * player.state.direction.x
+        pivot_y = player_tile.y + 2 * player.state.direction.y
 
-        return pivot - (self.game.controllers[0].actor.tile() - pivot)
+        blinky_tile = self.game.controllers[const.BLINKY_INDEX].actor.tile()
+        return 2 * pivot_x - blinky_tile.x, 2 * pivot_y - blinky_tile.y
 
     def check_active(self) -> bool:
         """Returns whether or not the ghost controller will be reactivate.
@@ -462,20 +490,20 @@ class ClydeController(GhostController):
         super().reset()
         self.state = 'inactive'
 
-    def scatter_target(self) -> Vector:
+    def scatter_target(self) -> tuple[int, int]:
         """Returns the target tile during scatter mode, the bottom left corner. """
-        return Vector(0, 35)
+        return 0, 35
 
-    def chase_target(self) -> Vector:
+    def chase_target(self) -> tuple[int, int]:
         """Returns the target tile during chase mode, which PacMan itself, unless Clyde is within
         8 tiles of PacMan, for which it uses its scatter target.
         """
         player_tile = self.game.player_actor().tile()
 
         if grid_distance(self.actor.tile(), player_tile) > 8:
-            return player_tile
+            return player_tile.x, player_tile.y
         else:
-            return Vector(0, 35)
+            return 0, 35
 
     def check_active(self) -> bool:
         """Returns whether or not the ghost controller will be reactivate.
@@ -493,7 +521,7 @@ class ClydeController(GhostController):
 if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['random', 'pygame', 'game_constants', 'game_state',
+        'extra-imports': ['pygame', 'game_constants', 'game_state',
                           'helpers', 'vector'],
         'max-line-length': 100,
         'disable': ['E1136', 'E1101']
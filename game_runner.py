@@ -2,14 +2,13 @@
 
 Module containing the Game class used to run simulations for training.
 """
-from copy import deepcopy
-from typing import Type, Optional
+from typing import Callable, Type, Optional
 import csv
-import random
 import pygame
 
 from ai_neural_net import NeuralNetGraph
 from game_state import Actor, ActorState, GameState
+from helpers import aabb_overlap, within_grid
 from vector import Vector
 
 import ai_controls
@@ -25,17 +24,25 @@ class Game:
         - screen: The pygame screen used for drawing onto.
         - font: The font used for writing on screen.
         - state: The state of the current game.
-        - grid: The map of the game tiles.
+        - grid: The map of the game tiles, stored row by row in a flat array.
     """
     clock: pygame.time.Clock
     screen: Optional[pygame.Surface]
     font: Optional[pygame.font.Font]
     state: Optional[GameState]
-    grid: list[list[int]]
+    grid: bytearray
 
     # Private Instance Attributes:
     #  - _default_grid: The original map grid before gameplay.
-    _default_grid: list[list[int]]
+    #  - _legal_neighbors: The directions leading to a non-wall tile, indexed like the grid.
+    #  - _background: The pre-drawn static tiles of the map, if in visualized mode.
+    #  - _dot_indices: The grid indices of the dots and boosts which are yet to be eaten.
+    #  - _tile_drawers: The function drawing each type of tile, indexed by tile type.
+    _default_grid: bytes
+    _legal_neighbors: list[tuple[tuple[int, Vector, int, int], ...]]
+    _background: Optional[pygame.Surface]
+    _dot_indices: set[int]
+    _tile_drawers: tuple[Optional[Callable[[Vector], None]], ...]
 
     def __init__(self, map_path: str) -> None:
         """Initializes a game with the original pre-gameplay map.
@@ -51,8 +58,28 @@ class Game:
         # Load the map
         with open(map_path) as csv_file:
             reader = csv.reader(csv_file)
-            self._default_grid = list(reader)
-        self.grid = []
+            self._default_grid = bytes(int(tile) for row in reader for tile in row)
+        self.grid = bytearray()
+        self._background = None
+        self._dot_indices = set()
+
+        # Look up drawing functions by tile type, covering every value a grid byte can hold.
+        drawers = {const.WALL: self._draw_wall, const.DOOR: self._draw_door,
+                   const.DOT: self._draw_dot, const.BOOST: self._draw_boost}
+        self._tile_drawers = tuple(drawers.get(tile) for tile in range(256))
+
+        # Precompute the legal directions at each tile, as walls never change during gameplay.
+        self._legal_neighbors = []
+        for y in range(const.GRID_SIZE.y):
+            for x in range(const.GRID_WIDTH):
+                neighbors = []
+                for key, direction, dx, dy in const.DIRECTION_ITEMS:
+                    candidate = Vector(x + dx, y + dy)
+                    index = candidate.y * const.GRID_WIDTH + candidate.x
+
+                    if within_grid(candidate) and not const.IS_BAD_TILE[self._default_grid[index]]:
+                        neighbors.append((key, direction, dx, dy))
+                self._legal_neighbors.append(tuple(neighbors))
 
     def run(self, player_controller: Type[game_controls.Controller] = game_controls.InputController,
             neural_net: NeuralNetGraph = None, seed: Optional[int] = None,
@@ -68,8 +95,6 @@ class Game:
         """
         if config is None:
             config = {}
-        if seed is not None:
-            random.seed(seed)
 
         # Default configurations
         lives = config.get('lives', const.DEFAULT_LIVES)
@@ -79,7 +104,7 @@ class Game:
         is_debug = config.get('is_debug', False)
 
         # Reinitialize the game state.
-        self.state = GameState(lives)
+        self.state = GameState(lives, self._legal_neighbors, seed)
         if has_ghosts:
             ghost_states = [ActorState(position, Vector(0, 0), colour, const.DEFAULT_SPEED)
                             for position, colour in zip(const.GHOST_POS, const.GHOST_COLOURS)]
@@ -96,10 +121,13 @@ class Game:
             player_controller(self.state, Actor())
 
         # New copy of original grid.
-        self.grid = deepcopy(self._default_grid)
+        self.grid = bytearray(self._default_grid)
         if not has_boosts:
-            self.grid = [[const.DOT if tile == const.BOOST else tile for tile in row]
-                         for row in self.grid]
+            self.grid = self.grid.translate(bytes.maketrans(bytes([const.BOOST]),
+                                                            bytes([const.DOT])))
+        self.state.dots_remaining = self.grid.count(const.DOT) + self.grid.count(const.BOOST)
+        self._dot_indices = {index for index, tile in enumerate(self.grid)
+                             if tile in {const.DOT, const.BOOST}}
 
         # Set up screen if visual.
         if is_visual:
@@ -109,6 +137,8 @@ class Game:
             self.font = pygame.font.SysFont('arial', 24)
             pygame.display.set_caption('Pac-Man!')
 
+            self._background = self.draw_background(is_debug)
+
         # Start game loop
         game_over = False
         while not game_over:
@@ -153,20 +183,33 @@ class Game:
         # Update other timers
         state.timers.update()
 
+        # Values which don't change for the rest of the tick.
+        grid = self.grid
+        player = state.player()
+        player_actor = player.actor
+        ghosts = state.ghosts()
+        is_boost_over = state.timers.check_boost()
+
         # Control and update player
-        state.player().control(self.grid)
-        state.player_actor().update(self.grid)
+        player.control(grid)
+        player_actor.update(grid)
+
+        # Truncate to whole pixels for collisions, as a pygame Rect would.
+        player_x = int(player_actor.state.position.x)
+        player_y = int(player_actor.state.position.y)
 
         # Control and update ghosts
-        for ghost in state.ghosts():
-            if state.timers.check_boost():
+        for ghost in ghosts:
+            if is_boost_over:
                 ghost.set_frightened(False)
 
-            ghost.control(self.grid)
-            ghost.actor.update(self.grid)
+            ghost.control(grid)
+            ghost.actor.update(grid)
 
             # Ghost collisions
-            is_collide = state.player_actor().rect().colliderect(ghost.actor.rect())
+            ghost_position = ghost.actor.state.position
+            is_collide = aabb_overlap(player_x, player_y, int(ghost_position.x),
+                                      int(ghost_position.y), const.TILE_SIZE.x)
             if is_collide and ghost.get_frightened():
                 # Eat ghost if they are frightened.
                 ghost.set_frightened(False)
@@ -183,18 +226,24 @@ class Game:
                 break
 
         # Tile collisions
-        tile = state.player_actor().tile()
-        if self.grid[tile.y][tile.x] == const.DOT:
-            self.grid[tile.y][tile.x] = const.EMPTY
-            state.score += const.DOT_SCORE
-            state.dot_counter += 1
-        elif self.grid[tile.y][tile.x] == const.BOOST:
-            self.grid[tile.y][tile.x] = const.EMPTY
-            state.score += const.BOOST_SCORE
-            state.timers.set_boost()
-
-            for ghost in state.ghosts():
-                ghost.set_frightened(True)
+        tile = player_actor.tile()
+        index = tile.y * const.GRID_WIDTH + tile.x
+        tile_type = grid[index]
+        if tile_type == const.DOT or tile_type == const.BOOST:
+            # Eat the dot or boost.
+            grid[index] = const.EMPTY
+            self._dot_indices.discard(index)
+            state.dots_remaining -= 1
+
+            if tile_type == const.DOT:
+                state.score += const.DOT_SCORE
+                state.dot_counter += 1
+            else:
+                state.score += const.BOOST_SCORE
+                state.timers.set_boost()
+
+                for ghost in ghosts:
+                    ghost.set_frightened(True)
 
         # Check win and lose conditions
         if state.lives <= 0 or self.check_win():
@@ -223,12 +272,10 @@ class Game:
         Args:
             - is_debug: Whether to draw debug information or not.
         """
-        self.screen.fill((0, 0, 0))
-
-        # Draw each tile in grid.
-        for y, row in enumerate(self.grid):
-            for x, tile in enumerate(row):
-                self.draw_tile(tile, x, y, is_debug)
+        # Draw the static tiles, then only the remaining dots and boosts.
+        self.screen.blit(self._background, (0, 0))
+        for index in self._dot_indices:
+            self.draw_tile(self.grid[index], index % const.GRID_WIDTH, index // const.GRID_WIDTH)
 
         # Draw debug information.
         if is_debug:
@@ -245,12 +292,28 @@ class Game:
                                           (255, 255, 255)), (5, 5))
         pygame.display.update()
 
+    def draw_background(self, is_debug: bool = False) -> pygame.Surface:
+        """Returns a surface with the tiles which never change during gameplay drawn onto it.
+
+        Args:
+            - is_debug: Whether to draw debug information or not.
+        """
+        self.screen.fill((0, 0, 0))
+
+        # Draw each wall and door in grid, and the grid overlay if debugging.
+        for index, tile in enumerate(self.grid):
+            if tile not in {const.WALL, const.DOOR}:
+                tile = const.EMPTY
+            self.draw_tile(tile, index % const.GRID_WIDTH, index // const.GRID_WIDTH, is_debug)
+
+        return self.screen.copy()
+
     def draw_debug(self) -> None:
         """Draws controller debug information to the pygame screen. """
         for controller in self.state.controllers:
             controller.draw_debug(self.screen)
 
-    def draw_tile(self, tile: str, x: int, y: int, debug: bool = False) -> None:
+    def draw_tile(self, tile: int, x: int, y: int, debug: bool = False) -> None:
         """Draws the tile at position to the pygame screen.
 
         Args:
@@ -261,33 +324,61 @@ class Game:
         """
         position = const.TILE_SIZE * (x, y)
 
-        # Draws depending on the type of tile.
-        if tile == const.WALL:
-            pygame.draw.rect(self.screen, (0, 0, 255), pygame.Rect(*position, *const.TILE_SIZE))
-        elif tile == const.DOOR:
-            pygame.draw.rect(self.screen, (255, 150, 200), pygame.Rect(*position, *const.TILE_SIZE))
-        elif tile == const.DOT:
-            pygame.draw.circle(self.screen, (200, 200, 150),
-                               (position + const.TILE_SIZE / 2).tuple(), 2)
-        elif tile == const.BOOST:
-            pygame.draw.circle(self.screen, (220, 220, 220),
-                               (position + const.TILE_SIZE / 2).tuple(), 5)
+        # Draws depending on the type of tile, empty tiles have no drawer.
+        drawer = self._tile_drawers[tile]
+        if drawer is not None:
+            drawer(position)
 
         # Draw an overlay of grids.
         if debug:
             pygame.draw.rect(self.screen, (100, 100, 100),
                              pygame.Rect(*position, *const.TILE_SIZE), width=1)
 
+    def _draw_wall(self, position: Vector) -> None:
+        """Draws a wall tile to the pygame screen.
+
+        Args:
+            - position: The pixel position of the tile's top left corner.
+        """
+        pygame.draw.rect(self.screen, (0, 0, 255), pygame.Rect(*position, *const.TILE_SIZE))
+
+    def _draw_door(self, position: Vector) -> None:
+        """Draws a door tile to the pygame screen.
+
+        Args:
+            - position: The pixel position of the tile's top left corner.
+        """
+        pygame.draw.rect(self.screen, (255, 150, 200), pygame.Rect(*position, *const.TILE_SIZE))
+
+    def _draw_dot(self, position: Vector) -> None:
+        """Draws a dot tile to the pygame screen.
+
+        Args:
+            - position: The pixel position of the tile's top left corner.
+        """
+        pygame.draw.circle(self.screen, (200, 200, 150),
+                           (position + const.TILE_SIZE / 2).tuple(), 2)
+
+    def _draw_boost(self, position: Vector) -> None:
+        """Draws a boost tile to the pygame screen.
+
+        Args:
+            - position: The pixel position of the tile's top left corner.
+        """
+        pygame.draw.circle(self.screen, (220, 220, 220),
+                           (position + const.TILE_SIZE / 2).tuple(), 5)
+
     def check_win(self) -> bool:
         """Return if game is won, when all dots and boosts are eaten. """
-        return not any(tile in {const.DOT, const.BOOST} for row in self.grid for tile in row)
+        return self.state.dots_remaining == 0
 
 
 if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['copy', 'csv', 'random', 'pygame', 'ai_controls', 'ai_neural_net',
-                          'game_constants', 'game_controls', 'game_state', 'vector'],
+        'extra-imports': ['csv', 'pygame', 'ai_controls', 'ai_neural_net',
+                          'game_constants', 'game_controls', 'game_state', 'helpers',
+                          'vector'],
         'allowed-io': ['__init__'],
         'max-line-length': 100,
         'disable': ['E1136', 'E1101']
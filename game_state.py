@@ -6,7 +6,8 @@ from __future__ import annotations
 
 from copy import copy
 from dataclasses import dataclass
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Sequence, TYPE_CHECKING
+import random
 import pygame
 
 from helpers import within_grid
@@ -74,7 +75,7 @@ class Actor:
         """Return the actor's bounding rectangle. """
         return pygame.Rect(*self.state.position, *const.TILE_SIZE)
 
-    def change_direction(self, grid: list[list[int]], direction: Vector) -> None:
+    def change_direction(self, grid: bytearray, direction: Vector) -> None:
         """Change directions to direction vector depending on if valid at current state.
 
         Args:
@@ -92,7 +93,7 @@ class Actor:
                 # Queue the direction if not valid yet.
                 self._queued_direction = direction
 
-    def valid_direction(self, grid: list[list[int]], direction: Vector) -> bool:
+    def valid_direction(self, grid: bytearray, direction: Vector) -> bool:
         """Return whether or not direction leads to a valid tile.
 
         Args:
@@ -100,7 +101,8 @@ class Actor:
             - direction: The direction to be tested.
         """
         next_tile = self.tile() + direction
-        return within_grid(next_tile) and grid[next_tile.y][next_tile.x] not in const.BAD_TILES
+        return within_grid(next_tile) and \
+            not const.IS_BAD_TILE[grid[next_tile.y * const.GRID_WIDTH + next_tile.x]]
 
     def within_cornering(self) -> bool:
         """Return whether or not player can turn at this point of the tile. """
@@ -128,7 +130,7 @@ class Actor:
         """
         return abs(self.state.direction.x) == abs(direction.x)
 
-    def update(self, grid: list[list[int]]) -> None:
+    def update(self, grid: bytearray) -> None:
         """Updates the actor's current state; moves or turns the actor.
 
         Args:
@@ -142,7 +144,8 @@ class Actor:
         next_tile = self.tile() + self.state.direction
 
         # Gets the next valid tile in direction.
-        if not within_grid(next_tile) or grid[next_tile.y][next_tile.x] in const.BAD_TILES:
+        if not within_grid(next_tile) or \
+                const.IS_BAD_TILE[grid[next_tile.y * const.GRID_WIDTH + next_tile.x]]:
             next_tile = tile
 
         # Chooses target tile depending on movement direction
@@ -315,39 +318,53 @@ class GameState:
         - lives: The amount of lives the player has.
         - score: The current game state's score.
         - dot_counter: The amount of dots the player has eaten.
+        - dots_remaining: The amount of dots and boosts left to be eaten.
         - timers: The timer states for the game.
+        - legal_neighbors: The directions leading to a non-wall tile, indexed like the grid.
+        - rng: The random number generator used for this game only.
 
     Representation Invariants:
         - self.score >= 0
         - self.dot_counter >= 0
+        - self.dots_remaining >= 0
 
         - Player is the last element in self.controllers
     """
     controllers: list[game_controls.Controller]
-    events: Optional[list[pygame.event.Event]]
+    events: Sequence[pygame.event.Event]
 
     lost_life: bool
     lives: int
     score: int
     dot_counter: int
+    dots_remaining: int
 
     timers: TimerState
+    legal_neighbors: list[tuple[tuple[int, Vector, int, int], ...]]
+    rng: random.Random
 
-    def __init__(self, lives: int) -> None:
+    def __init__(self, lives: int,
+                 legal_neighbors: list[tuple[tuple[int, Vector, int, int], ...]],
+                 seed: Optional[int] = None) -> None:
         """Initializes the game state with amount of initial lives.
 
         Args:
             - lives: The initial amount of lives the player has.
+            - legal_neighbors: The legal directions at each tile of the game's map grid.
+            - seed: The random seed for the game's random number generator.
         """
         self.controllers = []
-        self.events = None
+        self.events = ()
 
         self.lost_life = False
         self.lives = lives
         self.score = 0
 
         self.dot_counter = 0
+        self.dots_remaining = 0
         self.timers = TimerState()
+        self.legal_neighbors = legal_neighbors
+        self.rng = random.Random(seed)
 
     def player(self) -> game_controls.Controller:
         """Returns the player's controller, using the representation invariant. """
@@ -373,8 +390,8 @@ class GameState:
 if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['copy', 'dataclasses', 'pygame', 'game_constants', 'game_controls',
-                          'helpers', 'vector'],
+        'extra-imports': ['copy', 'dataclasses', 'random', 'pygame', 'game_constants',
+                          'game_controls', 'helpers', 'vector'],
         'max-line-length': 100,
         'disable': ['E1136']
     })
@@ -34,6 +34,27 @@ def within_grid(vector: Vector) -> bool:
     return 0 <= vector.x < const.GRID_SIZE.x and 0 <= vector.y < const.GRID_SIZE.y
 
 
+def aabb_overlap(x1: int, y1: int, x2: int, y2: int, size: int) -> bool:
+    """Returns whether two square boxes of the same size overlap, given their top left corners.
+
+    Args:
+        - x1: The x-coordinate of the first box.
+        - y1: The y-coordinate of the first box.
+        - x2: The x-coordinate of the second box.
+        - y2: The y-coordinate of the second box.
+        - size: The side length of both boxes.
+
+    Preconditions:
+        - size > 0
+
+    >>> aabb_overlap(0, 0, 15, 15, 16)
+    True
+    >>> aabb_overlap(0, 0, 16, 0, 16)
+    False
+    """
+    return abs(x1 - x2) < size and abs(y1 - y2) < size
+
+
 def clamp(number: float, min_val: float, max_val: float) -> float:
     """Retuned the value of number clamped between min_val and max_val.
 